@@ -1,4 +1,92 @@
+from __future__ import annotations
 import re
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Tuple, Union
+
+
+_ERR_REPR = (
+    "incorrect SVG node style representation (ex: 'green@12', '#aa8ef7@3', "
+    "'#f00@38', 'rgb(122,17,234)@7', 'rgb(23%,5%,100%)@10', ..."
+)
+_ERR_COLOR = (
+    "incorrect color (ex: 'green', '#aa8ef7', '#f00', 'rgb(122,17,234)', "
+    "'rgb(23%,5%,100%)', ...)"
+)
+_ERR_SIZE = 'the size has to be an integer in [0, 100]'
+
+# see https://www.w3.org/TR/2011/REC-SVG11-20110816/types.html#ColorKeywords
+_BASE_COLORS = frozenset((
+    'aliceblue', 'antiquewhite', 'aqua', 'aquamarine', 'azure', 'beige',
+    'bisque', 'black', 'blanchedalmond', 'blue', 'blueviolet', 'brown',
+    'burlywood', 'cadetblue', 'chartreuse', 'chocolate', 'coral',
+    'cornflowerblue', 'cornsilk', 'crimson', 'cyan', 'darkblue',
+    'darkcyan', 'darkgoldenrod', 'darkgray', 'darkgreen', 'darkgrey',
+    'darkkhaki', 'darkmagenta', 'darkolivegreen', 'darkorange',
+    'darkorchid', 'darkred', 'darksalmon', 'darkseagreen', 'darkslateblue',
+    'darkslategray', 'darkslategrey', 'darkturquoise', 'darkviolet',
+    'deeppink', 'deepskyblue', 'dimgray', 'dimgrey', 'dodgerblue',
+    'firebrick', 'floralwhite', 'forestgreen', 'fuchsia', 'gainsboro',
+    'ghostwhite', 'gold', 'goldenrod', 'gray', 'grey', 'green',
+    'greenyellow', 'honeydew', 'hotpink', 'indianred', 'indigo', 'ivory',
+    'khaki', 'lavender', 'lavenderblush', 'lawngreen', 'lemonchiffon',
+    'lightblue', 'lightcoral', 'lightcyan', 'lightgoldenrodyellow',
+    'lightgray', 'lightgreen', 'lightgrey', 'lightpink', 'lightsalmon',
+    'lightseagreen', 'lightskyblue', 'lightslategray', 'lightslategrey',
+    'lightsteelblue', 'lightyellow', 'lime', 'limegreen', 'linen',
+    'magenta', 'maroon', 'mediumaquamarine', 'mediumblue', 'mediumorchid',
+    'mediumpurple', 'mediumseagreen', 'mediumslateblue',
+    'mediumspringgreen', 'mediumturquoise', 'mediumvioletred',
+    'midnightblue', 'mintcream', 'mistyrose', 'moccasin', 'navajowhite',
+    'navy', 'oldlace', 'olive', 'olivedrab', 'orange', 'orangered',
+    'orchid', 'palegoldenrod', 'palegreen', 'paleturquoise',
+    'palevioletred', 'papayawhip', 'peachpuff', 'peru', 'pink', 'plum',
+    'powderblue', 'purple', 'red', 'rosybrown', 'royalblue', 'saddlebrown',
+    'salmon', 'sandybrown', 'seagreen', 'seashell', 'sienna', 'silver',
+    'skyblue', 'slateblue', 'slategray', 'slategrey', 'snow',
+    'springgreen', 'steelblue', 'tan', 'teal', 'thistle', 'tomato',
+    'turquoise', 'violet', 'wheat', 'white', 'whitesmoke', 'yellow',
+    'yellowgreen'
+))
+
+# lowercase hexadecimal digits allowed in the '#rgb' and '#rrggbb' notations
+_HEXSET = frozenset('0123456789abcdef')
+
+# to be used with fullmatch, match lowercased colors in value notation like
+# 'rgb(122,17,234)', 'rgb( 122, 17, 234 )', ... or in percentage notation like
+# 'rgb(23%,5%,100%)', 'rgb( 23%, 5 %, 100% )', ...
+_RGB_RE = re.compile(
+    r'rgb\('
+    r'(?:\s?[0-9]{1,3}\s?(?:,\s?[0-9]{1,3}\s?){2}'
+    r'|\s?[0-9]{1,3}\s?%\s?(?:,\s?[0-9]{1,3}\s?%\s?){2})'
+    r'\)',
+    re.ASCII
+)
+
+# map a valid color to its SVG id: remove '#', ')' and the whitespace
+# characters matched by the ASCII '\s' of _RGB_RE, replace '(' and ',' by '.'
+# and '%' by 'p'
+_COLOR_ID_TABLE = str.maketrans({
+    '#': None, ')': None,
+    ' ': None, '\t': None, '\n': None, '\r': None, '\f': None, '\v': None,
+    '(': '.', ',': '.',
+    '%': 'p'
+})
+
+
+def _is_hex(color: str) -> bool:
+    """Return ``True`` if the lowercased color is in hexadecimal notation
+    (``'#aa8ef7'``, ``'#f00'``, ...)."""
+    return (len(color) in (4, 7) and
+            color[0] == '#' and
+            _HEXSET.issuperset(color[1:]))
+
+
+@lru_cache(maxsize=512)
+def _build_color_id(color: str) -> str:
+    """Return the SVG ``id`` compliant version of a valid color (see
+    :meth:`NodeStyle.get_color_id`), cached by color."""
+    return sys.intern(color.translate(_COLOR_ID_TABLE))
 
 
 class NodeStyle:
@@ -9,17 +97,24 @@ class NodeStyle:
     ``'#aa8ef7@3'``, ``'#f00@38'``, ``'rgb(122,17,234)@7'``, ``'rgb(23%,5%,
     100%)@10'``, ...
 
+    A ``NodeStyle`` object is immutable, the same object being shared by all
+    the nodes using its representation.
+
     Attributes:
-        color: Background color of the node circle, see **Notes** under.
-        size: Radius of the node circle in pixel, has to be an integer in
+        color: Read-only background color of the node circle, see **Notes**
+            under.
+        size: Read-only radius of the node circle in pixel, an integer in
             [0, 100].
+        color_id: Read-only SVG ``id`` compliant version of the color, see
+            :meth:`get_color_id`.
 
     Notes:
         To respect the
         `W3C SVG 1.1 (Second Edition) Recommendation - Section 4.2 <https://www.w3.org/TR/2011/REC-SVG11-20110816/types.html#BasicDataTypes>`_
         , the following color notations are allowed:
 
-        - base color: ``aliceblue``, ``darkturquoise``, ``lightcoral``, ... (see
+        - base color (case insensitive): ``aliceblue``, ``darkturquoise``,
+          ``lightcoral``, ``LightCoral``, ... (see
           `W3C SVG 1.1 (Second Edition) Recommendation - Section 4.4 <https://www.w3.org/TR/2011/REC-SVG11-20110816/types.html#ColorKeywords>`_
           )
         - hexadecimal notation (short or long): ``#aa8ef7``, ``#F7AA9E``,
@@ -28,6 +123,8 @@ class NodeStyle:
           137)``, ``rgb(23%,5%,100%)``, ``RGB(23 %, 5 %, 100 %)``, ...
     """
 
+    __slots__ = ('_color', '_size', '_color_id')
+
     def __init__(self, representation: str = 'blue@12'):
         """Create a ``NodeStyle`` object.
 
@@ -52,19 +149,81 @@ class NodeStyle:
             ValueError: incorrect color (ex: 'green', '#aa8ef7', '#f00',
             'rgb(122,17,234)', 'rgb(23%,5%,100%)', ...)
         """
-        if not re.search(r'^.+@[0-9]+$', representation):
-            raise ValueError(
-                "incorrect SVG node style representation (ex: 'green@12', "
-                "'#aa8ef7@3', '#f00@38', 'rgb(122,17,234)@7', 'rgb(23%,5%,"
-                "100%)@10', ..."
-            )
+        self._color, self._size = NodeStyle._parse(representation)
+
+    @classmethod
+    def parse_many(cls, representations: Iterable[str]) -> List[NodeStyle]:
+        """Return the ``NodeStyle`` object of each given representation,
+        shared like the ones returned by :meth:`get`.
+
+        Args:
+            representations: Short representations of the node styles.
+
+        Returns:
+            The node styles, in the order of the given representations.
+
+        Raises:
+            ValueError: If one of the given representations is incorrect.
+
+        Examples:
+            >>> NodeStyle.parse_many(['green@12', '#aa8ef7@3', 'green@12'])
+            [<NodeStyle: color='green', size=12>, <NodeStyle: color='#aa8ef7', size=3>, <NodeStyle: color='green', size=12>]
+        """
+        get = cls.get
+        return [get(representation) for representation in representations]
 
-        # we need to remove extra ''
-        # see https://docs.python.org/2/library/re.html#re.split
-        chuncks = [s for s in re.split(r'@', representation) if s != '']
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def get(cls, representation: str) -> NodeStyle:
+        """Return the ``NodeStyle`` object of a representation, shared between
+        all the callers using this representation.
 
-        self.color = NodeStyle._get_valid_color(chuncks[0])
-        self.size = NodeStyle._get_valid_size(chuncks[1])
+        Args:
+            representation: Short representation of the node style.
+
+        Raises:
+            ValueError: If the given representation is incorrect.
+
+        Examples:
+            >>> NodeStyle.get('green@12')
+            <NodeStyle: color='green', size=12>
+            >>> NodeStyle.get('green@12') is NodeStyle.get('green@12')
+            True
+        """
+        return cls(representation)
+
+    @staticmethod
+    def _parse(representation: str) -> Tuple[str, int]:
+        """Return the valid color and size of a representation or raise an
+        error.
+
+        The result is not cached, the styles shared by the nodes are cached
+        by :meth:`get`.
+
+        Args:
+            representation: Short representation of the node style.
+
+        Returns:
+            (color, size)
+
+        Raises:
+            ValueError: If the given representation is incorrect.
+        """
+        color, separator, size = representation.rpartition('@')
+
+        if not separator or not color or not (size.isascii() and size.isdigit()):
+            raise ValueError(_ERR_REPR)
+
+        # the size check is the cheapest, fail fast on it
+        size = NodeStyle._get_valid_size(size)
+        color = NodeStyle._get_valid_color(color)
+
+        # nodes of a tree often share a few colors, intern the short ones so
+        # that they share a single string object
+        if len(color) < 32:
+            color = sys.intern(color)
+
+        return color, size
 
     @staticmethod
     def _get_valid_color(color: str) -> str:
@@ -77,93 +236,39 @@ class NodeStyle:
             ValueError: If the given color doesn't match the SVG colors
             requirements described above.
         """
-        # see https://www.w3.org/TR/2011/REC-SVG11-20110816/types.html#ColorKeywords
-        base_color_list = [
-            'aliceblue', 'antiquewhite', 'aqua', 'aquamarine', 'azure',
-            'beige', 'bisque', 'black', 'blanchedalmond', 'blue',
-            'blueviolet', 'brown', 'burlywood', 'cadetblue', 'chartreuse',
-            'chocolate', 'coral', 'cornflowerblue', 'cornsilk', 'crimson',
-            'cyan', 'darkblue', 'darkcyan', 'darkgoldenrod', 'darkgray',
-            'darkgreen', 'darkgrey', 'darkkhaki', 'darkmagenta',
-            'darkolivegreen', 'darkorange', 'darkorchid', 'darkred',
-            'darksalmon', 'darkseagreen', 'darkslateblue', 'darkslategray',
-            'darkslategrey', 'darkturquoise',
-            'darkviolet', 'deeppink', 'deepskyblue', 'dimgray', 'dimgrey',
-            'dodgerblue', 'firebrick', 'floralwhite',
-            'forestgreen', 'fuchsia', 'gainsboro', 'ghostwhite', 'gold',
-            'goldenrod', 'gray', 'grey', 'green',
-            'greenyellow', 'honeydew', 'hotpink', 'indianred', 'indigo',
-            'ivory', 'khaki', 'lavender', 'lavenderblush',
-            'lawngreen', 'lemonchiffon', 'lightblue', 'lightcoral', 'lightcyan',
-            'lightgoldenrodyellow', 'lightgray',
-            'lightgreen', 'lightgrey', 'lightpink', 'lightsalmon',
-            'lightseagreen', 'lightskyblue', 'lightslategray',
-            'lightslategrey', 'lightsteelblue', 'lightyellow', 'lime',
-            'limegreen', 'linen', 'magenta', 'maroon',
-            'mediumaquamarine', 'mediumblue', 'mediumorchid', 'mediumpurple',
-            'mediumseagreen', 'mediumslateblue',
-            'mediumspringgreen', 'mediumturquoise', 'mediumvioletred',
-            'midnightblue', 'mintcream', 'mistyrose',
-            'moccasin', 'navajowhite', 'navy', 'oldlace', 'olive', 'olivedrab',
-            'orange', 'orangered', 'orchid',
-            'palegoldenrod', 'palegreen', 'paleturquoise', 'palevioletred',
-            'papayawhip', 'peachpuff', 'peru', 'pink',
-            'plum', 'powderblue', 'purple', 'red', 'rosybrown', 'royalblue',
-            'saddlebrown', 'salmon', 'sandybrown',
-            'seagreen', 'seashell', 'sienna', 'silver', 'skyblue', 'slateblue',
-            'slategray', 'slategrey', 'snow',
-            'springgreen', 'steelblue', 'tan', 'teal', 'thistle', 'tomato',
-            'turquoise', 'violet', 'wheat', 'white',
-            'whitesmoke', 'yellow', 'yellowgreen'
-        ]
-
-        # match one or two groups of 3 alphanumeric characters ('#aa8ef7',
-        # '#F7AA9E', '#f00', '#FFF', ...)
-        hexadec_notation_regex = re.compile(
-            r'^#([a-f0-9]{3}){1,2}$',
-            re.IGNORECASE
-        )
-
-        # match colors like 'rgb(122,17,234)', 'rGb(122,17,234)', 'rgb( 122,
-        # 17, 234 )', ...
-        rgb_notation_val_regex = re.compile(
-            r'^rgb\(\s?[0-9]{1,3}\s?(,\s?[0-9]{1,3}\s?){2}\)',
-            re.IGNORECASE
-        )
-
-        # match colors like 'rgb(23%,5%,100%)', 'rGb(23%,5%,100%)',
-        # 'rgb( 23%, 5 %, 100% )', ...
-        rgb_notation_per_regex = re.compile(
-            r'^rgb\(\s?[0-9]{1,3}\s?%\s?(,\s?[0-9]{1,3}\s?%\s?){2}\)$',
-            re.IGNORECASE
-        )
-
-        if (color not in base_color_list and
-                not hexadec_notation_regex.search(color) and
-                not rgb_notation_val_regex.search(color) and
-                not rgb_notation_per_regex.search(color)
-        ):
-            raise ValueError(
-                "incorrect color (ex: 'green', '#aa8ef7', '#f00', 'rgb(122,"
-                "17,234)', 'rgb(23%,5%,100%)', ...)"
-            )
-
-        return color
+        # the notations are case insensitive, lowercase once and keep the
+        # original color for the SVG output
+        lowercase_color = color.lower()
+
+        # most trees use keyword colors, check them first without any regex
+        if lowercase_color in _BASE_COLORS:
+            return color
+
+        # past the keywords, a color starting with '#' can only be in
+        # hexadecimal notation and any other one only in rgb notation
+        if lowercase_color[:1] == '#':
+            if _is_hex(lowercase_color):
+                return color
+        elif _RGB_RE.fullmatch(lowercase_color):
+            return color
+
+        raise ValueError(_ERR_COLOR)
 
     @staticmethod
-    def _get_valid_size(size: str) -> int:
+    def _get_valid_size(size: Union[str, int]) -> int:
         """Return a valid size in [0, 100] or raise an error.
 
         Args:
-            size: Size string.
+            size: Size string or integer.
 
         Raises:
             ValueError: If the given size is not in [0, 100].
         """
-        size = int(size)
+        if not isinstance(size, int):
+            size = int(size)
 
-        if size < 0 or size > 100:
-            raise ValueError('the size has to be an integer in [0, 100]')
+        if not 0 <= size <= 100:
+            raise ValueError(_ERR_SIZE)
 
         return size
 
@@ -175,6 +280,29 @@ class NodeStyle:
         """Return a string representing the style."""
         return f'{self.color}@{self.size}'
 
+    @property
+    def color(self) -> str:
+        """Background color of the node circle."""
+        return self._color
+
+    @property
+    def size(self) -> int:
+        """Radius of the node circle in pixel."""
+        return self._size
+
+    @property
+    def color_id(self) -> str:
+        """Color id of the node style, see :meth:`get_color_id`.
+
+        It is computed on first access and then cached, the cache can't get
+        out of date as :attr:`color` is read-only.
+        """
+        try:
+            return self._color_id
+        except AttributeError:
+            self._color_id = _build_color_id(self.color)
+            return self._color_id
+
     def get_color_id(self) -> str:
         """Return a string representing the color with a unique id that
         respects the SVG recommendation.
@@ -202,11 +330,4 @@ class NodeStyle:
             >>> NodeStyle('rgb( 23%, 5 %, 100% )@8').get_color_id()
             'rgb.23p.5p.100p'
         """
-        color_id = self.color
-
-        # remove '#', ')' and whitespace characters
-        color_id = re.sub(r'#|\)|\s', '', color_id)
-        color_id = re.sub(r'\(|,', '.', color_id)  # replace '(' and ',' by '.'
-        color_id = re.sub(r'%', 'p', color_id)  # replace '%' by 'p'
-
-        return color_id
\ No newline at end of file
+        return self.color_id
\ No newline at end of file
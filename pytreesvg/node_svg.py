@@ -2,10 +2,33 @@
 
 from __future__ import annotations
 import random
-from typing import Any, List, Optional, Tuple
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
 
 from pytreesvg.node_style import NodeStyle
-from pytreesvg.utils.tools import map_value
+
+
+# default style of the nodes, shared by all the nodes created without a style
+_DEFAULT_STYLE_STR = 'blue@12'
+_DEFAULT_STYLE = NodeStyle.get(_DEFAULT_STYLE_STR)
+
+
+@lru_cache(maxsize=2048)
+def _gradient_id(parent_color_id: str, child_color_id: str) -> str:
+    """Return the id of the linear gradient color going from the parent node
+    color to the child node color.
+
+    The id is interned, it is used as a set key when creating the gradient
+    definitions."""
+    return sys.intern(f'grad_{parent_color_id}_{child_color_id}')
+
+
+@lru_cache(maxsize=2048)
+def _gradient_url(parent_color_id: str, child_color_id: str) -> str:
+    """Return the paint reference to the linear gradient color going from the
+    parent node color to the child node color."""
+    return f'url(#{_gradient_id(parent_color_id, child_color_id)})'
 
 
 class NodeSVG:
@@ -18,7 +41,8 @@ class NodeSVG:
     Attributes:
         value: Node value.
         children: Node children, can be empty.
-        style: SVG style of the node.
+        style: SVG style of the node, shared with the other nodes created with
+            the same style representation.
         x: Circle `x` position in the SVG image in pixel.
         y: Circle `y` position in the SVG image in pixel.
 
@@ -30,17 +54,19 @@ class NodeSVG:
         .
     """
 
+    __slots__ = ('value', 'children', 'style', 'x', 'y')
+
     def __init__(self,
                  value: Optional[Any] = None,
                  children: Optional[List[Any]] = None,
-                 style: str = 'blue@12'):
+                 style: Union[str, NodeStyle] = _DEFAULT_STYLE_STR):
         """Create a ``NodeSVG`` object.
 
         Args:
             value: Node value.
             children: Node children.
             style: ``NodeStyle`` string short representation defining the SVG
-                style of the node.
+                style of the node, or ``NodeStyle`` object.
 
         Examples:
             >>> NodeSVG('+', children=[NodeSVG(1, style='aqua@16'), NodeSVG(2), NodeSVG(3)])
@@ -65,34 +91,71 @@ class NodeSVG:
         else:
             self.children = []
 
-        self.style = NodeStyle(style)
+        if style is _DEFAULT_STYLE_STR:
+            self.style = _DEFAULT_STYLE
+        elif isinstance(style, NodeStyle):
+            self.style = style
+        else:
+            self.style = NodeStyle.get(style)
 
         self.x = 0.0
         self.y = 0.0
 
-    def __repr__(self, depth: int = 0) -> str:
+    def __repr__(self) -> str:
         """Return a string representing the node and its children as a tree (
         with their SVG style and position)."""
-        string_tree = (f'{self.value!r} ({self.style}, x: {self.x:.2f}, '
-                       f'y: {self.y:.2f})')
+        return self._get_string_tree(
+            lambda node: (f'{node.value!r} ({node.style}, x: {node.x:.2f}, '
+                          f'y: {node.y:.2f})')
+        )
+
+    def __str__(self) -> str:
+        """Return a string representing the node and its children as a tree."""
+        return self._get_string_tree(lambda node: str(node.value))
+
+    def _get_string_tree(self, node_to_string: Callable[[NodeSVG], str]) -> str:
+        """Return a string representing the node and its children as a tree.
 
-        indentation = '    ' * depth
+        Args:
+            node_to_string: Function returning the string representing a
+                single node.
+        """
+        lines = []
 
-        for child in self.children:
-            string_tree += f'\n{indentation}└── {child.__repr__(depth + 1)}'
+        # line prefix of each depth, built once per depth (a node being
+        # visited after its parent, its depth is at most one more than the
+        # deepest depth seen so far)
+        prefixes = ['']
 
-        return string_tree
+        for node, depth in self._iter_dfs_preorder():
+            if depth == len(prefixes):
+                prefixes.append(f'{"    " * (depth - 1)}└── ')
 
-    def __str__(self, depth: int = 0) -> str:
-        """Return a string representing the node and its children as a tree."""
-        string_tree = str(self.value)
+            lines.append(prefixes[depth] + node_to_string(node))
+
+        return '\n'.join(lines)
 
-        indentation = '    ' * depth
+    def _iter_dfs_preorder(self) -> Iterator[Tuple[NodeSVG, int]]:
+        """Yield the node and its descendants in depth-first pre-order (a
+        node before its children, children in their original order).
+
+        The traversal is iterative, the tree depth is not limited by the
+        recursion limit.
+
+        Yields:
+            (node, depth of the node from this node)
+        """
+        stack = [(self, 0)]
 
-        for child in self.children:
-            string_tree += f'\n{indentation}└── {child.__str__(depth + 1)}'
+        # children are pushed in reverse order to be popped in their original
+        # order
+        while stack:
+            node, depth = stack.pop()
 
-        return string_tree
+            yield node, depth
+
+            stack.extend((child, depth + 1)
+                         for child in reversed(node.children))
 
     def add_child(self, child: NodeSVG):
         """Add a child to the node.
@@ -101,7 +164,7 @@ class NodeSVG:
             child: Child to add.
 
         Raises:
-            TypeError: If child is not of type ``NodeSVG``.
+            TypeError: If child is not of type ``NodeSVG`` (or a subclass).
 
         Examples
         --------
@@ -132,9 +195,18 @@ class NodeSVG:
             root node
             └── new value!
         """
-        if type(child) is not NodeSVG:
+        if not isinstance(child, NodeSVG):
             raise TypeError('child parameter has to be of type NodeSVG')
 
+        self._add_child_unchecked(child)
+
+    def _add_child_unchecked(self, child: NodeSVG):
+        """Add a child to the node without checking its type.
+
+        Args:
+            child: Child to add, it has to be of type ``NodeSVG`` (or a
+                subclass).
+        """
         self.children.append(child)
 
     def is_leaf(self) -> bool:
@@ -172,17 +244,23 @@ class NodeSVG:
             >>> basic_tree.get_depth()
             2
         """
-        if self.is_leaf():
-            return current_node_depth
-        else:
-            return max(
-                [child.get_depth(current_node_depth + 1) for child in self.children]
-            )
+        depth = 0
+        level = self.children
+
+        # level by level traversal, each level holds the children of the
+        # nodes of the previous one, the tree depth is not limited by the
+        # recursion limit
+        while level:
+            depth += 1
+            level = [child for node in level for child in node.children]
+
+        return current_node_depth + depth
 
     @staticmethod
     def get_random_node(values: List[Any] = range(0, 10),
                         sizes: List[int] = range(5, 21),
-                        colors: Optional[List[str]] = None) -> NodeSVG:
+                        colors: Optional[List[str]] = None,
+                        rng: Optional[random.Random] = None) -> NodeSVG:
         """Return a random ``NodeSVG`` object.
 
         Args:
@@ -191,6 +269,8 @@ class NodeSVG:
             colors: List of possible colors for the random node, if not
                 specified the color will be selected randomly over the whole
                 color spectrum.
+            rng: Random number generator to use, if not specified the
+                ``random`` module global generator is used.
 
         Notes:
             This functions uses the ``random`` module. If you need reproducible
@@ -201,6 +281,11 @@ class NodeSVG:
 
                 random.seed(42) # set random number generator seed to 42
 
+            or give it a dedicated random number generator, which leaves the
+            global generator untouched::
+
+                NodeSVG.get_random_node(rng=random.Random(42))
+
         Examples:
             >>> import random
             >>> random.seed(42)
@@ -221,16 +306,22 @@ class NodeSVG:
                 # good syntax
                 NodeSVG.get_random_node(values=[1])
         """
+        if rng is None:
+            rng = random
+
+        choice = rng.choice
+
         if colors:
-            color = random.choice(colors)
+            color = choice(colors)
         else:
             # pick random color over the whole color spectrum
-            color = (f'rgb({random.randint(0, 255)},{random.randint(0, 255)},'
-                     f'{random.randint(0, 255)})')
+            randint = rng.randint
+            color = (f'rgb({randint(0, 255)},{randint(0, 255)},'
+                     f'{randint(0, 255)})')
 
         return NodeSVG(
-            value=random.choice(values),
-            style=f'{color}@{random.choice(sizes)}'
+            value=choice(values),
+            style=f'{color}@{choice(sizes)}'
         )
 
     @staticmethod
@@ -238,7 +329,8 @@ class NodeSVG:
                         n_children: List[int] = range(0, 5),
                         values: List[Any] = range(0, 10),
                         sizes: List[int] = range(5, 21),
-                        colors: List[str] = None) -> Optional[NodeSVG]:
+                        colors: List[str] = None,
+                        rng: Optional[random.Random] = None) -> Optional[NodeSVG]:
         """Return a ``NodeSVG`` object being the root node of a random tree.
 
         Args:
@@ -250,6 +342,8 @@ class NodeSVG:
             colors: List of possible colors for the random nodes,
                 if not specified the color will be selected randomly over the
                 whole color spectrum.
+            rng: Random number generator to use, if not specified the
+                ``random`` module global generator is used.
 
         Notes:
             This functions uses the ``random`` module. If you need reproducible
@@ -260,6 +354,11 @@ class NodeSVG:
 
                 random.seed(42) # set random number generator seed to 42
 
+            or give it a dedicated random number generator, which leaves the
+            global generator untouched::
+
+                NodeSVG.get_random_tree(rng=random.Random(42))
+
         Examples:
             >>> import random
             >>> random.seed(16)
@@ -310,23 +409,42 @@ class NodeSVG:
         if max_depth < 0:
             return None
 
-        # create random root node
-        root_node = NodeSVG.get_random_node(values, sizes, colors)
+        if rng is None:
+            rng = random
 
-        # choose a random number of children
-        n_children_per_node = random.choice(n_children)
+        # local names for the functions called for each node
+        choice = rng.choice
+        get_random_node = NodeSVG.get_random_node
 
-        for i in range(n_children_per_node):
-            # create new random subtree
-            new_node = NodeSVG.get_random_tree(
-                max_depth - 1,
-                n_children,
-                values,
-                sizes,
-                colors
-            )
-            if new_node is not None:
-                root_node.add_child(new_node)
+        root_node = None
+
+        # iterative depth-first construction, each stack item holds the parent
+        # of a node to create (None for the root node) and the max depth of
+        # the subtree to create from this node
+        stack = [(None, max_depth)]
+
+        while stack:
+            parent_node, subtree_max_depth = stack.pop()
+
+            # create random node
+            node = get_random_node(values, sizes, colors, rng)
+
+            if parent_node is None:
+                root_node = node
+            else:
+                # the node is a NodeSVG object, no need to check it
+                parent_node._add_child_unchecked(node)
+
+            # choose a random number of children, even if the node can't have
+            # any, so that the random draws only depend on the random seed
+            n_children_per_node = choice(n_children)
+
+            if subtree_max_depth > 0:
+                # the children are created one subtree after the other, in the
+                # order they are added to the node
+                stack.extend(
+                    [(node, subtree_max_depth - 1)] * n_children_per_node
+                )
 
         return root_node
 
@@ -335,7 +453,9 @@ class NodeSVG:
                width: int = 400,
                height: int = 400,
                gradient_color: bool = True,
-               image_border: bool = True):
+               image_border: bool = True,
+               precision: Optional[int] = 2,
+               compact: bool = False):
         """Create a SVG image and draw the tree.
 
         Danger:
@@ -350,10 +470,17 @@ class NodeSVG:
             gradient_color: Set to ``True`` to apply linear gradient colors
                 to edges between differently colored nodes.
             image_border: Set to ``True`` to draw the image border.
+            precision: Number of decimals of the node coordinates in the SVG
+                image, set to ``None`` to write the coordinates with their
+                full float precision.
+            compact: Set to ``True`` to produce a smaller SVG image, the nodes
+                are written without indentation and comments and the edges
+                from a node to its children sharing the same color are drawn
+                as a single path.
         
         Raises:
             ValueError: If the given width or height are not integers in [10,
-                10000].
+                10000], or if the given precision is negative.
 
         Notes:
             The `DOCTYPE` for SVG 1.1 is
@@ -379,220 +506,273 @@ class NodeSVG:
                 'in [10, 10000]'
             )
 
-        self._recursively_compute_x_position(width)
-        self._recursively_compute_y_position(height)
+        if precision is None:
+            # an empty format specification gives the float full precision
+            coordinate_format = ''
+        else:
+            precision = int(precision)
 
-        with open(path, 'w') as SVG_file:
-            header = (
-                f'<?xml version="1.0" encoding="utf-8" standalone="no"?>\n\n'
-                f'<svg width="{width}" height="{height}" '
-                f'version="1.1" xmlns="http://www.w3.org/2000/svg">\n\n'
-            )
+            if precision < 0:
+                raise ValueError('the precision has to be a non-negative integer')
 
-            if gradient_color:
-                defs = ('    <defs>\n'
-                        '        <!-- linear gradient definitions -->\n' +
-                        self._recursively_get_svg_gradient_color_defs()[0] +
-                        '    </defs>\n\n')
-            else:
-                defs = ''
+            coordinate_format = f'.{precision}f'
 
-            title = (
-                f'    <!-- image title -->\n'
-                f'    <title>Tree graphic created with pytreesvg</title>\n\n'
-            )
+        header = (
+            f'<?xml version="1.0" encoding="utf-8" standalone="no"?>\n\n'
+            f'<svg width="{width}" height="{height}" '
+            f'version="1.1" xmlns="http://www.w3.org/2000/svg">\n\n'
+        )
+
+        title = (
+            f'    <!-- image title -->\n'
+            f'    <title>Tree graphic created with pytreesvg</title>\n\n'
+        )
+
+        # the SVG fragments are streamed to the file as they are produced
+        # instead of building the whole image in memory
+        with open(path, 'w', buffering=1 << 16) as SVG_file:
+            SVG_file.write(header)
+            SVG_file.write(title)
+
+            if gradient_color:
+                SVG_file.write('    <defs>\n'
+                               '        <!-- linear gradient definitions -->\n')
+                SVG_file.writelines(
+                    self._iter_svg_gradient_color_defs()
+                )
+                SVG_file.write('    </defs>\n\n')
 
             if image_border:
-                border = (
+                SVG_file.write(
                     f'    <!-- image border -->\n'
                     f'    <rect x="0" y="0" width="{width}" height="{height}" '
                     f'style="stroke: #000000; fill: none;"/>\n\n'
                 )
-            else:
-                border = ''
-
-            corpse = self._recursively_get_svg_representation(gradient_color)
-
-            backer = '</svg>\n'
-
-            SVG_file.write(header + title + defs + border + corpse + backer)
-
-    def _recursively_compute_y_position(self,
-                                        svg_height: int,
-                                        current_node_depth: int = 0,
-                                        tree_depth: Optional[int] = None):
-        """Recursively compute the `y` position of the node and its children
-        in the SVG image.
-
-        The function used to compute the :math:`y` position of a node at
-        depth :math:`t` belonging to a tree of total depth :math:`T` in a SVG
-        image of height :math:`h` is
-        
-        .. math::
-            f : [0, T] & \\to     ]0, h[ \\\\
-                t      & \\mapsto \\text{map}(t, -0.5, T + 0.5, 0, h)
 
-        (see :func:`pytreesvg.tools.map`).
+            SVG_file.writelines(
+                self._iter_svg_representation(width, height, gradient_color,
+                                              coordinate_format, compact)
+            )
 
-        Args:
-            svg_height: Total height of the SVG image.
-            current_node_depth: Depth of the current node in the tree.
-            tree_depth: Total depth of the tree.
-        """
-        if not tree_depth:
-            tree_depth = self.get_depth()
+            SVG_file.write('</svg>\n')
 
-        self.y = map_value(
-            current_node_depth,
-            -0.5, tree_depth + 0.5,
-            0, svg_height
-        )
+    def _iter_svg_representation(self,
+                                 svg_width: int,
+                                 svg_height: int,
+                                 gradient_color: bool,
+                                 coordinate_format: str = '',
+                                 compact: bool = False) -> Iterator[str]:
+        """Compute the position of the node and its children in the SVG image
+        and yield their SVG representation.
 
-        for child in self.children:
-            child._recursively_compute_y_position(
-                svg_height,
-                current_node_depth + 1,
-                tree_depth
-            )
+        The positions are computed in the same traversal of the tree as the
+        SVG representation, a node position being computed when its parent
+        edges are drawn.
 
-    def _recursively_compute_x_position(self,
-                                        parent_svg_width: float,
-                                        level_svg_offset: float = 0.0,
-                                        current_node_index: int = 0,
-                                        nb_node_current_level: int = 1):
-        """Recursively compute the `x` position of the node and its children
-        in the SVG image.
+        Each node is given a horizontal slot of the SVG image, the root node
+        slot being the whole image width. The slot of a node is split in
+        equal parts between its children and the node is drawn at the middle
+        of its slot.
 
         The function used to compute the :math:`x` position of a node at
         index :math:`i` belonging to a siblings group (later called a
-        `level`) of :math:`n` nodes and a SVG parent node width of :math:`w`
-        beginning at position :math:`x_p` is
+        `level`) of :math:`n` nodes and a SVG parent node slot of width
+        :math:`w` beginning at position :math:`x_p` is
         
         .. math::
             f : [0, n-1] & \\to     ]0, w[ \\\\
-                i        & \\mapsto x_p + \\text{map}(i, -0.5, n - 0.5, 0, w)
-
-        (see :func:`pytreesvg.tools.map`).
-
-        Args:
-            parent_svg_width: SVG width of the parent node.
-            level_svg_offset: SVG x offset of the current level.
-            current_node_index: Current node index in the current level.
-            nb_node_current_level: Number of node in the current level.
-        """
-        self.x = level_svg_offset + map_value(
-            current_node_index,
-            -0.5, nb_node_current_level - 0.5,
-            0, parent_svg_width
-        )
-
-        new_parent_svg_width = parent_svg_width / nb_node_current_level
-        new_level_svg_offset = level_svg_offset + map_value(
-            current_node_index - 1,
-            -1, nb_node_current_level - 1,
-            0, parent_svg_width
-        )
+                i        & \\mapsto x_p + \\text{map}(i, -0.5, n - 0.5, 0, w) =
+                           x_p + (i + 0.5) \\frac{w}{n}
 
-        for i, child in enumerate(self.children):
-            child._recursively_compute_x_position(
-                parent_svg_width=new_parent_svg_width,
-                level_svg_offset=new_level_svg_offset,
-                current_node_index=i,
-                nb_node_current_level=len(self.children)
-            )
+        The function used to compute the :math:`y` position of a node at
+        depth :math:`t` belonging to a tree of total depth :math:`T` in a SVG
+        image of height :math:`h` is
+        
+        .. math::
+            f : [0, T] & \\to     ]0, h[ \\\\
+                t      & \\mapsto \\text{map}(t, -0.5, T + 0.5, 0, h) =
+                         (t + 0.5) \\frac{h}{T + 1}
 
-    def _recursively_get_svg_representation(self,
-                                            gradient_color: bool,
-                                            indentation: str = '    ') -> str:
-        """Recursively get the SVG representation of the node and its children.
+        (see :func:`pytreesvg.utils.tools.map_value`).
 
         Args:
+            svg_width: Total width of the SVG image.
+            svg_height: Total height of the SVG image.
             gradient_color: If some gradient colors have been defined in the
                 SVG `defs` section (by using
-                :meth:`_recursively_get_svg_gradient_color_defs` when
+                :meth:`_iter_svg_gradient_color_defs` when
                 creating the SVG image), set to ``True`` to use these colors
                 for the edges.
-            indentation: Spaces before the current node SVG string to
-                distinguish children from parents.
-
-        Returns:
-            SVG representation of the node and its children.
+            coordinate_format: Format specification of the node coordinates,
+                the default empty specification writes them with their full
+                float precision.
+            compact: Set to ``True`` to write the nodes without indentation
+                and comments, and to draw the edges from a node to its
+                children sharing the same color as a single path, the
+                attributes shared by all the edges being set once on a
+                group.
+
+        Yields:
+            Successive fragments of the SVG representation of the node and its
+            children.
         """
-        current_node_svg_representation = (f'{indentation}<!-- Node '
-                                           f'{self.value!r} -->\n')
-
-        # draw node edges
-        for child in self.children:
-            if gradient_color:
-                if self.style.color == child.style.color:
-                    # no need for gradient color
-                    color = self.style.color
+        # height of a level, the same for the whole tree
+        level_svg_height = svg_height / (self.get_depth() + 1)
+
+        self.x = 0.5 * svg_width
+        self.y = 0.5 * level_svg_height
+
+        if compact:
+            # no indentation and no comments, the attributes shared by all the
+            # edges are set once on a group
+            indentation_step = ''
+            node_end = '\n'
+            yield '<g stroke-width="2" fill="none">\n'
+        else:
+            indentation_step = '    '
+            node_end = '\n\n'
+
+        # spaces before the SVG strings of each depth to distinguish children
+        # from parents, built once per depth
+        indentations = [indentation_step]
+
+        # iterative depth-first traversal, each stack item holds a node with
+        # the SVG x offset and width of its slot and its depth
+        stack = [(self, 0.0, float(svg_width), 0)]
+
+        while stack:
+            node, slot_svg_offset, slot_svg_width, depth = stack.pop()
+
+            indentation = indentations[depth]
+
+            children = node.children
+            node_style = node.style
+            node_color = node_style.color
+
+            if not compact:
+                yield f'{indentation}<!-- Node {node.value!r} -->\n'
+
+            if children:
+                # all the children share the same slot width and y position
+                child_slot_svg_width = slot_svg_width / len(children)
+                child_y = (depth + 1.5) * level_svg_height
+                child_items = []
+
+                if depth + 1 == len(indentations):
+                    indentations.append(indentation + indentation_step)
+
+            # draw node edges, the part of the edge string depending only on
+            # the node is formatted once for all its children
+            node_x = f'{node.x:{coordinate_format}}'
+            node_y = f'{node.y:{coordinate_format}}'
+            edge_start = f'{indentation}<line x1="{node_x}" y1="{node_y}" '
+
+            if compact:
+                # children of the node grouped by edge color, in the order of
+                # their first edge
+                edge_groups = {}
+
+            for i, child in enumerate(children):
+                # compute child position
+                child_slot_svg_offset = slot_svg_offset + i * child_slot_svg_width
+                child.x = child_slot_svg_offset + 0.5 * child_slot_svg_width
+                child.y = child_y
+
+                child_items.append((child, child_slot_svg_offset,
+                                    child_slot_svg_width, depth + 1))
+
+                if gradient_color:
+                    child_style = child.style
+
+                    if node_color == child_style.color:
+                        # no need for gradient color
+                        color = node_color
+                    else:
+                        # find the gradient color previously defined
+                        color = _gradient_url(node_style.color_id,
+                                              child_style.color_id)
                 else:
-                    # find the gradient color previously defined
-                    color = (f'url(#grad_{self.style.get_color_id()}_'
-                             f'{child.style.get_color_id()})')
-            else:
-                color = 'black'
+                    color = 'black'
 
-            current_node_svg_representation += (
-                f'{indentation}<line x1="{self.x}" y1="{self.y}" '
-                f'x2="{child.x}" y2="{child.y}" '
-                f'stroke="{color}" stroke-width="2"/> '
-                f'<!-- edge to node {child.value!r} -->\n'
-            )
+                if compact:
+                    edge_groups.setdefault(color, []).append(child)
+                else:
+                    yield (f'{edge_start}x2="{child.x:{coordinate_format}}" '
+                           f'y2="{child_y:{coordinate_format}}" '
+                           f'stroke="{color}" stroke-width="2"/> '
+                           f'<!-- edge to node {child.value!r} -->\n')
+
+            if compact:
+                # draw the edges of the same color as a single path made of
+                # one subpath per edge
+                for color, edge_children in edge_groups.items():
+                    path = ' '.join(
+                        f'M{node_x} {node_y} L{child.x:{coordinate_format}} '
+                        f'{child_y:{coordinate_format}}'
+                        for child in edge_children
+                    )
 
-        # draw node
-        current_node_svg_representation += (
-            f'{indentation}<circle cx="{self.x}" cy="{self.y}" '
-            f'r="{self.style.size}" fill="{self.style.color}"/>\n\n'
-        )
+                    yield f'{indentation}<path d="{path}" stroke="{color}"/>\n'
 
-        children_svg_representation = ''
+            # draw node
+            yield (f'{indentation}<circle cx="{node_x}" cy="{node_y}" '
+                   f'r="{node_style.size}" fill="{node_color}"/>{node_end}')
 
-        for child in self.children:
-            children_svg_representation += \
-            child._recursively_get_svg_representation(
-                gradient_color,
-                indentation + '    '
-            )
+            # children are pushed in reverse order to be drawn in their
+            # original order
+            if children:
+                child_items.reverse()
+                stack.extend(child_items)
 
-        return current_node_svg_representation + children_svg_representation
+        if compact:
+            yield '</g>\n'
 
-    def _recursively_get_svg_gradient_color_defs(
-            self,
-            created_gradient_list: Optional[List[str]] = None
-    ) -> Tuple[str, List[str]]:
-        """Recursively create all the necessary linear gradient color
-        definitions.
+    def _iter_svg_gradient_color_defs(self) -> Iterator[str]:
+        """Yield all the necessary linear gradient color definitions of the
+        node and its children.
 
-        Args:
-            created_gradient_list: List of gradient colors id already created.
-
-        Returns:
-            (gradient color definitions of the node and its children, already
-            created gradient colors)
+        Yields:
+            Gradient color definitions of the node and its children, each
+            gradient color being defined once.
         """
-        if not created_gradient_list:
-            created_gradient_list = []
-
-        self.svg_gradient = ''
-
-        for child in self.children:
-            gradient_id = (f'grad_{self.style.get_color_id()}_'
-                           f'{child.style.get_color_id()}')
-
-            if (self.style.color != child.style.color and
-                gradient_id not in created_gradient_list):
-                self.svg_gradient += (
-                    f'        <linearGradient id="{gradient_id}" x1="0%" x2="0%" y1="0%" y2="100%">\n'
-                    f'           <stop offset="0%" stop-color="{self.style.color}"/>\n'
-                    f'           <stop offset="100%" stop-color="{child.style.color}"/>\n'
-                    f'        </linearGradient>\n')
-                created_gradient_list.append(gradient_id)
-                (child_gradient, created_gradient_list) = \
-                    child._recursively_get_svg_gradient_color_defs(
-                        created_gradient_list
-                    )
-                self.svg_gradient += child_gradient
-
-        return self.svg_gradient, created_gradient_list
+        # gradient colors id already created, the definitions are yielded in
+        # the order of the traversal so only the membership test is needed
+        created_gradient_ids = set()
+
+        # id of the nodes whose subtree is already visited, a node added to
+        # several parents has its subtree edges visited only once
+        visited_node_ids = {id(self)}
+
+        # iterative depth-first traversal of the tree edges, each stack item
+        # holds a parent node and one of its children, children are pushed in
+        # reverse order to be popped in their original order
+        stack = [(self, child) for child in reversed(self.children)]
+
+        while stack:
+            parent, child = stack.pop()
+
+            parent_style = parent.style
+            child_style = child.style
+            parent_color = parent_style.color
+            child_color = child_style.color
+
+            if parent_color != child_color:
+                gradient_id = _gradient_id(parent_style.color_id,
+                                           child_style.color_id)
+
+                if gradient_id not in created_gradient_ids:
+                    yield (
+                        f'        <linearGradient id="{gradient_id}" x1="0%" x2="0%" y1="0%" y2="100%">\n'
+                        f'           <stop offset="0%" stop-color="{parent_color}"/>\n'
+                        f'           <stop offset="100%" stop-color="{child_color}"/>\n'
+                        f'        </linearGradient>\n')
+                    created_gradient_ids.add(gradient_id)
+
+            # the whole subtree is visited, a child edge can need a gradient
+            # color even if the parent edge doesn't
+            if id(child) not in visited_node_ids:
+                visited_node_ids.add(id(child))
+                stack.extend(
+                    (child, grandchild)
+                    for grandchild in reversed(child.children)
+                )
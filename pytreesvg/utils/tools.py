@@ -24,12 +24,12 @@ def map_value(x: float, a: float, b: float, c: float, d: float) -> float:
         ValueError: If ``a = b`` (i.e. the origin interval is empty).
 
     Examples:
-        >>> map(1, 0, 5, 0, 10)
+        >>> map_value(1, 0, 5, 0, 10)
         2.0
 
         >>> # convert 30 degrees in radian
         >>> import math
-        >>> map(30, 0, 360, 0, 2 * math.pi)
+        >>> map_value(30, 0, 360, 0, 2 * math.pi)
         0.5235987755982988
     """
     if a == b:
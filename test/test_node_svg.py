@@ -1,77 +1,110 @@
 import unittest
-import sys, os
-sys.path.insert(0, os.path.abspath('pytreesvg'))
 
 from pytreesvg.node_svg import NodeStyle, NodeSVG
+import copy
 import random
 
 class TestClassNodeStyle(unittest.TestCase):
     """Unit test for the ``NodeStyle`` class."""
 
-    def setUp(self):
-        self.style_1 = NodeStyle('green@12')
-        self.style_2 = NodeStyle('#aa8ef7@3')
-        self.style_3 = NodeStyle('#f00@38')
-        self.style_4 = NodeStyle('rgb(122,17,234)@7')
-        self.style_5 = NodeStyle('rgb(23%,5%,100%)@10')
+    @classmethod
+    def setUpClass(cls):
+        # the styles are never modified by the tests, they are shared
+        cls.style_1 = NodeStyle.get('green@12')
+        cls.style_2 = NodeStyle.get('#aa8ef7@3')
+        cls.style_3 = NodeStyle.get('#f00@38')
+        cls.style_4 = NodeStyle.get('rgb(122,17,234)@7')
+        cls.style_5 = NodeStyle.get('rgb(23%,5%,100%)@10')
 
     def test_init(self):
-        with self.assertRaises(ValueError): NodeStyle('')
-        with self.assertRaises(ValueError): NodeStyle('@')
-        with self.assertRaises(ValueError): NodeStyle('#@')
-        with self.assertRaises(ValueError): NodeStyle('#green')
-        with self.assertRaises(ValueError): NodeStyle('@12')
-        with self.assertRaises(ValueError): NodeStyle('12')
+        for representation in ['', '@', '#@', '#green', '@12', '12',
+                               'green@١٢', 'green@²']:
+            with self.subTest(representation=representation):
+                with self.assertRaises(ValueError): NodeStyle(representation)
+
+    def test_parse_many(self):
+        styles = NodeStyle.parse_many(['green@12', '#aa8ef7@3', 'rgb(122,17,234)@7'])
+        self.assertEqual([repr(style) for style in styles], [repr(self.style_1), repr(self.style_2), repr(self.style_4)])
+        self.assertEqual(styles[2].get_color_id(), 'rgb.122.17.234')
+        self.assertIs(styles[0], NodeStyle.get('green@12'))
+
+        with self.assertRaises(ValueError): NodeStyle.parse_many(['green@12', 'lol@12'])
+
+    def test_get(self):
+        self.assertEqual(repr(NodeStyle.get('green@12')), repr(self.style_1))
+        self.assertIs(NodeStyle.get('green@12'), NodeStyle.get('green@12'))
+        with self.assertRaises(ValueError): NodeStyle.get('lol@12')
 
     def test_get_valid_color(self):
-        with self.assertRaises(ValueError): NodeStyle._get_valid_color('lol')
-        with self.assertRaises(ValueError): NodeStyle._get_valid_color('12')
-        with self.assertRaises(ValueError): NodeStyle._get_valid_color('fff')
-        with self.assertRaises(ValueError): NodeStyle._get_valid_color('#FF87')
-        with self.assertRaises(ValueError): NodeStyle._get_valid_color('#rgb(122,17,234)')
-
-        NodeStyle._get_valid_color('#F7AA9E')
-        NodeStyle._get_valid_color('#FFF')
-        NodeStyle._get_valid_color('rGb(122,17,234)')
-        NodeStyle._get_valid_color('rgb( 122, 17, 234 )')
-        NodeStyle._get_valid_color('rGb(23%,5%,100%)')
-        NodeStyle._get_valid_color('rgb( 23%, 5 %, 100% )')
+        for color in ['lol', '12', 'fff', '#FF87', '#rgb(122,17,234)', 'rgb(122,17,234)xyz']:
+            with self.subTest(color=color):
+                with self.assertRaises(ValueError): NodeStyle._get_valid_color(color)
+
+        for color in ['#F7AA9E', '#FFF', 'rGb(122,17,234)', 'rgb( 122, 17, 234 )', 'rGb(23%,5%,100%)',
+                      'rgb( 23%, 5 %, 100% )', 'Green', 'LightCoral']:
+            with self.subTest(color=color):
+                NodeStyle._get_valid_color(color)
 
     def test_get_valid_size(self):
-        with self.assertRaises(ValueError): NodeStyle._get_valid_size('125')
-        with self.assertRaises(ValueError): NodeStyle._get_valid_size('-2')
+        for size in ['125', '-2']:
+            with self.subTest(size=size):
+                with self.assertRaises(ValueError): NodeStyle._get_valid_size(size)
 
     def test_repr(self):
-        self.assertEqual(repr(self.style_1), "<NodeStyle: color='green', size=12>")
-        self.assertEqual(repr(self.style_2), "<NodeStyle: color='#aa8ef7', size=3>")
-        self.assertEqual(repr(self.style_3), "<NodeStyle: color='#f00', size=38>")
-        self.assertEqual(repr(self.style_4), "<NodeStyle: color='rgb(122,17,234)', size=7>")
-        self.assertEqual(repr(self.style_5), "<NodeStyle: color='rgb(23%,5%,100%)', size=10>")
+        for style, expected in [(self.style_1, "<NodeStyle: color='green', size=12>"),
+                                (self.style_2, "<NodeStyle: color='#aa8ef7', size=3>"),
+                                (self.style_3, "<NodeStyle: color='#f00', size=38>"),
+                                (self.style_4, "<NodeStyle: color='rgb(122,17,234)', size=7>"),
+                                (self.style_5, "<NodeStyle: color='rgb(23%,5%,100%)', size=10>")]:
+            with self.subTest(style=expected):
+                self.assertEqual(repr(style), expected)
 
     def test_str(self):
-        self.assertEqual(str(self.style_1), 'green@12')
-        self.assertEqual(str(self.style_2), '#aa8ef7@3')
-        self.assertEqual(str(self.style_3), '#f00@38')
-        self.assertEqual(str(self.style_4), 'rgb(122,17,234)@7')
-        self.assertEqual(str(self.style_5), 'rgb(23%,5%,100%)@10')
+        for style, expected in [(self.style_1, 'green@12'),
+                                (self.style_2, '#aa8ef7@3'),
+                                (self.style_3, '#f00@38'),
+                                (self.style_4, 'rgb(122,17,234)@7'),
+                                (self.style_5, 'rgb(23%,5%,100%)@10')]:
+            with self.subTest(style=expected):
+                self.assertEqual(str(style), expected)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.style_1, '__dict__'))
+        with self.assertRaises(AttributeError): self.style_1.other = 1
+
+    def test_immutable(self):
+        # the styles are shared between nodes, they can't be modified
+        style = NodeSVG(1).style
+        with self.assertRaises(AttributeError): style.color = 'red'
+        with self.assertRaises(AttributeError): style.size = 3
+        self.assertEqual(str(NodeSVG(2).style), 'blue@12')
 
     def test_get_color_id(self):
-        self.assertEqual(self.style_1.get_color_id(), 'green')
-        self.assertEqual(self.style_2.get_color_id(), 'aa8ef7')
-        self.assertEqual(self.style_3.get_color_id(), 'f00')
-        self.assertEqual(self.style_4.get_color_id(), 'rgb.122.17.234')
-        self.assertEqual(self.style_5.get_color_id(), 'rgb.23p.5p.100p')
-
-        self.assertEqual(NodeStyle('rgb( 122, 17, 234 )@7').get_color_id(), 'rgb.122.17.234')
-        self.assertEqual(NodeStyle('rgb( 23%, 5 %, 100% )@7').get_color_id(), 'rgb.23p.5p.100p')
+        for representation, expected in [('green@12', 'green'),
+                                         ('#aa8ef7@3', 'aa8ef7'),
+                                         ('#f00@38', 'f00'),
+                                         ('rgb(122,17,234)@7', 'rgb.122.17.234'),
+                                         ('rgb(23%,5%,100%)@10', 'rgb.23p.5p.100p'),
+                                         ('rgb( 122, 17, 234 )@7', 'rgb.122.17.234'),
+                                         ('rgb( 23%, 5 %, 100% )@7', 'rgb.23p.5p.100p')]:
+            with self.subTest(representation=representation):
+                self.assertEqual(NodeStyle.get(representation).get_color_id(), expected)
+
+        # the cached id follows the color as the color can't be changed
+        style = NodeStyle('green@12')
+        self.assertEqual(style.color_id, 'green')
+        with self.assertRaises(AttributeError): style.color = 'red'
+        self.assertEqual(style.color_id, 'green')
 
 
 class TestClassNodeSVG(unittest.TestCase):
     """Unit test for the ``NodeSVG`` class."""
 
-    def setUp(self):
-        self.basic_tree   = NodeSVG('+', children=[NodeSVG(1), NodeSVG(2), NodeSVG(3)])
-        self.complex_tree = NodeSVG('-', children=[NodeSVG(1), NodeSVG('*', children=[NodeSVG(5), NodeSVG(4)])])
+    @classmethod
+    def setUpClass(cls):
+        # the trees are shared, tests modifying them work on a deep copy
+        cls.basic_tree   = NodeSVG('+', children=[NodeSVG(1), NodeSVG(2), NodeSVG(3)])
+        cls.complex_tree = NodeSVG('-', children=[NodeSVG(1), NodeSVG('*', children=[NodeSVG(5), NodeSVG(4)])])
 
     def test_repr(self):
         self.assertEqual(repr(self.basic_tree), "'+' (blue@12, x: 0.00, y: 0.00)\n"
@@ -97,6 +130,18 @@ class TestClassNodeSVG(unittest.TestCase):
                                                  '    └── 5\n'
                                                  '    └── 4')
 
+    def test_slots(self):
+        self.assertFalse(hasattr(self.basic_tree, '__dict__'))
+        with self.assertRaises(AttributeError): self.basic_tree.other = 1
+
+    def test_init(self):
+        self.assertIs(NodeSVG(1, style='aqua@16').style, NodeSVG(2, style='aqua@16').style)
+        self.assertIs(NodeSVG(1, style=NodeStyle.get('aqua@16')).style, NodeStyle.get('aqua@16'))
+
+    def test_iter_dfs_preorder(self):
+        self.assertEqual([(node.value, depth) for node, depth in self.complex_tree._iter_dfs_preorder()],
+                         [('-', 0), (1, 1), ('*', 1), (5, 2), (4, 2)])
+
     def test_add_child(self):
         tree = NodeSVG('root node')
         with self.assertRaises(TypeError): tree.add_child(1)
@@ -106,6 +151,15 @@ class TestClassNodeSVG(unittest.TestCase):
         self.assertEqual(str(tree), 'root node\n'
                                     '└── child node')
 
+        # subclasses of NodeSVG are accepted
+        class Sub(NodeSVG):
+            __slots__ = ()
+
+        tree.add_child(Sub('sub node'))
+        self.assertEqual(str(tree), 'root node\n'
+                                    '└── child node\n'
+                                    '└── sub node')
+
     def test_is_leaf(self):
         self.assertEqual(self.basic_tree.is_leaf(), False)
         self.assertEqual(self.basic_tree.children[0].is_leaf(), True)
@@ -114,31 +168,115 @@ class TestClassNodeSVG(unittest.TestCase):
         self.assertEqual(self.basic_tree.get_depth(), 1)
         self.assertEqual(self.complex_tree.get_depth(), 2)
 
+        tree = NodeSVG('root node')
+        self.assertEqual(tree.get_depth(), 0)
+        tree.add_child(NodeSVG('child node', children=[NodeSVG('grandchild node')]))
+        self.assertEqual(tree.get_depth(), 2)
+
+        # the depth follows the nodes added to a descendant
+        complex_tree = copy.deepcopy(self.complex_tree)
+        self.assertEqual(complex_tree.get_depth(), 2)
+        complex_tree.children[1].children[0].add_child(NodeSVG(6))
+        self.assertEqual(complex_tree.get_depth(), 3)
+        tree.children[0].children[0].add_child(NodeSVG('great-grandchild node'))
+        self.assertEqual(tree.get_depth(), 3)
+
+        # children appended directly are taken into account too
+        tree = NodeSVG(0, children=[NodeSVG(1)])
+        self.assertEqual(tree.get_depth(), 1)
+        tree.children[0].children.append(NodeSVG(2))
+        self.assertEqual(tree.get_depth(), 2)
+        self.assertEqual(tree.get_depth(current_node_depth=3), 5)
+
+    def test_iter_svg_gradient_color_defs(self):
+        # the gradient colors below an edge drawn without gradient color are defined too
+        tree = NodeSVG('red', style='red@12', children=[NodeSVG('red', style='red@12', children=[NodeSVG('blue', children=[NodeSVG('red', style='red@12')])]),
+                                                        NodeSVG('blue')])
+        defs = list(tree._iter_svg_gradient_color_defs())
+        self.assertEqual(len(defs), 2)
+        self.assertIn('id="grad_red_blue"', defs[0])
+        self.assertIn('id="grad_blue_red"', defs[1])
+
+        # a subtree shared by several parents is visited once
+        shared_node = NodeSVG('shared', style='red@12', children=[NodeSVG('blue')])
+        tree = NodeSVG('root', children=[shared_node, shared_node])
+        defs = list(tree._iter_svg_gradient_color_defs())
+        self.assertEqual(len(defs), 2)
+        self.assertIn('id="grad_blue_red"', defs[0])
+        self.assertIn('id="grad_red_blue"', defs[1])
+
+        # deep trees are not limited by the recursion limit
+        deep_tree = NodeSVG(0)
+        node = deep_tree
+        for i in range(1, 5000):
+            node.add_child(NodeSVG(i, style='red@12'))
+            node = node.children[0]
+        self.assertEqual(len(list(deep_tree._iter_svg_gradient_color_defs())), 1)
+
+    def test_iter_svg_representation(self):
+        # the node positions are computed while drawing
+        basic_tree = copy.deepcopy(self.basic_tree)
+
+        svg = ''.join(basic_tree._iter_svg_representation(300, 300, False, '.2f'))
+        self.assertIn('<line x1="150.00" y1="75.00" x2="50.00" y2="225.00" stroke="black"', svg)
+        self.assertIn('<circle cx="150.00" cy="75.00" r="12" fill="blue"/>', svg)
+        self.assertEqual(repr(basic_tree), "'+' (blue@12, x: 150.00, y: 75.00)\n"
+                                                "└── 1 (blue@12, x: 50.00, y: 225.00)\n"
+                                                "└── 2 (blue@12, x: 150.00, y: 225.00)\n"
+                                                "└── 3 (blue@12, x: 250.00, y: 225.00)")
+
+        svg = ''.join(basic_tree._iter_svg_representation(300, 300, False))
+        self.assertIn('<circle cx="150.0" cy="75.0" r="12" fill="blue"/>', svg)
+
+        svg = ''.join(basic_tree._iter_svg_representation(300, 300, False, '.2f', compact=True))
+        self.assertTrue(svg.startswith('<g stroke-width="2" fill="none">\n'
+                                       '<path d="M150.00 75.00 L50.00 225.00 M150.00 75.00 L150.00 225.00 M150.00 75.00 L250.00 225.00" '
+                                       'stroke="black"/>\n'
+                                       '<circle cx="150.00" cy="75.00" r="12" fill="blue"/>\n'))
+        self.assertTrue(svg.endswith('</g>\n'))
+        self.assertNotIn('<line', svg)
+        self.assertNotIn('<!--', svg)
+
+        with self.assertRaises(ValueError): basic_tree.to_svg(precision=-1)
+
+        # children appended directly are drawn inside the image
+        tree = NodeSVG(0, children=[NodeSVG(1)])
+        tree.get_depth()
+        tree.children[0].children.append(NodeSVG(2))
+        ''.join(tree._iter_svg_representation(400, 400, False))
+        for node, expected_y in [(tree, 400 / 6), (tree.children[0], 400 / 2), (tree.children[0].children[0], 5 * 400 / 6)]:
+            self.assertAlmostEqual(node.y, expected_y)
+
     def test_get_random_node(self):
-        random.seed(42)
+        # a dedicated random number generator leaves the global one untouched
+        rng = random.Random(42)
+        global_state = random.getstate()
 
-        self.assertEqual(repr(NodeSVG.get_random_node()), '3 (rgb(57,12,140)@12, x: 0.00, y: 0.00)')
+        self.assertEqual(repr(NodeSVG.get_random_node(rng=rng)), '3 (rgb(57,12,140)@12, x: 0.00, y: 0.00)')
 
         random_node = NodeSVG.get_random_node(values=['Michel', 'Julia', 'Robert'],
                                               sizes=[18, 1, 2],
-                                              colors=['aqua', 'salmon', '#ff8', 'rgb(10%, 22%, 13%)'])
+                                              colors=['aqua', 'salmon', '#ff8', 'rgb(10%, 22%, 13%)'],
+                                              rng=rng)
         self.assertEqual(repr(random_node), "'Robert' (salmon@18, x: 0.00, y: 0.00)")
+        self.assertEqual(random.getstate(), global_state)
 
         with self.assertRaises(TypeError): NodeSVG.get_random_node(values=1)
         with self.assertRaises(TypeError): NodeSVG.get_random_node(sizes=1)
         with self.assertRaises(Exception): NodeSVG.get_random_node(colors='aqua')
 
     def test_get_random_tree(self):
-        random.seed(42)
+        rng = random.Random(42)
 
-        self.assertEqual(repr(NodeSVG.get_random_tree()), '3 (rgb(57,12,140)@12, x: 0.00, y: 0.00)\n'
+        self.assertEqual(repr(NodeSVG.get_random_tree(rng=rng)), '3 (rgb(57,12,140)@12, x: 0.00, y: 0.00)\n'
                                                           '└── 0 (rgb(52,44,216)@5, x: 0.00, y: 0.00)')
 
         random_tree = NodeSVG.get_random_tree(max_depth=2,
                                               n_children=[2, 3],
                                               values=['Michel', 'Julia', 'Robert'],
                                               sizes=[18, 1, 2],
-                                              colors=['aqua', 'salmon', '#ff8', 'rgb(10%, 22%, 13%)'])
+                                              colors=['aqua', 'salmon', '#ff8', 'rgb(10%, 22%, 13%)'],
+                                              rng=rng)
         self.assertEqual(repr(random_tree), "'Michel' (salmon@2, x: 0.00, y: 0.00)\n"
                                             "└── 'Robert' (salmon@2, x: 0.00, y: 0.00)\n"
                                             "    └── 'Julia' (salmon@2, x: 0.00, y: 0.00)\n"
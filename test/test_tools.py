@@ -1,19 +1,19 @@
 import unittest
-import sys, os
-sys.path.insert(0, os.path.abspath('pytreesvg'))
 
-from pytreesvg.utils.tools import map
+from pytreesvg.utils.tools import map_value
 
 import math
 
 class TestModuleTools(unittest.TestCase):
     """Unit test for the ``tools`` module."""
 
-    def test_map(self):
-        self.assertEqual(map(1, 0, 2, 0, 10), 5.0)
-        self.assertEqual(map(30, 0, 180, 0, math.pi), 0.5235987755982988)
+    def test_map_value(self):
+        for args, expected in [((1, 0, 2, 0, 10), 5.0),
+                               ((30, 0, 180, 0, math.pi), math.pi / 6)]:
+            with self.subTest(args=args):
+                self.assertTrue(math.isclose(map_value(*args), expected, rel_tol=1e-12))
 
-        with self.assertRaises(ValueError): map(1, 1, 1, 0, 10)
+        with self.assertRaises(ValueError): map_value(1, 1, 1, 0, 10)
 
 
 # shell command to run the tests: